@@ -0,0 +1,163 @@
+"""Tests for the workout text parser."""
+
+import pytest
+
+from workout_creator import Intensity, StepType, TargetType, WorkoutParseError, WorkoutParser
+
+
+def parse_one(line: str):
+    steps = WorkoutParser().parse(line)
+    assert len(steps) == 1
+    return steps[0]
+
+
+def test_intensity_keyword_table_order_wins_over_line_position():
+    # 'warmup' and 'cooldown' rank above 'easy' in the intensity table
+    step = parse_one("easy warmup 10min")
+    assert step.name == "Warmup"
+    assert step.intensity == Intensity.WARMUP
+
+    step = parse_one("Easy cooldown 10min")
+    assert step.name == "Cooldown"
+    assert step.intensity == Intensity.COOLDOWN
+
+    # 'rest' ranks above 'tempo'
+    step = parse_one("tempo 20min 80% FTP rest")
+    assert step.intensity == Intensity.RECOVERY
+
+
+def test_special_keyword_table_order_wins_over_line_position():
+    # 'cooldown' ranks above 'recovery' in the special keyword table
+    step = parse_one("recovery 10min cooldown")
+    assert step.name == "Cooldown"
+    assert step.intensity == Intensity.COOLDOWN
+
+    # Keywords inside notes are ignored
+    step = parse_one('recovery 10min "spin easy until the cooldown"')
+    assert step.name == "Recovery"
+    assert step.intensity == Intensity.RECOVERY
+
+
+def test_line_cache_respects_subclass_overrides():
+    class DoubleDurationParser(WorkoutParser):
+        def _parse_duration(self, text):
+            duration = super()._parse_duration(text)
+            return None if duration is None else duration * 2
+
+    # Keyword and target lines both take their duration from the hook
+    for line in ("recovery 5min", "5min 90% FTP"):
+        assert WorkoutParser().parse(line)[0].duration_seconds == 300
+        assert DoubleDurationParser().parse(line)[0].duration_seconds == 600
+        assert WorkoutParser().parse(line)[0].duration_seconds == 300
+
+
+def test_subclass_init_args_and_state_are_used():
+    class ScaledParser(WorkoutParser):
+        def __init__(self, scale):
+            self.scale = scale
+
+        def _create_special_step(self, step_type, duration, notes=""):
+            return super()._create_special_step(step_type, duration * self.scale, notes)
+
+    assert ScaledParser(3).parse("recovery 5min")[0].duration_seconds == 900
+    assert ScaledParser(2).parse("recovery 5min")[0].duration_seconds == 600
+    assert WorkoutParser().parse("recovery 5min")[0].duration_seconds == 300
+
+
+def test_subclass_keyword_tables_are_used():
+    class SpinParser(WorkoutParser):
+        SPECIAL_KEYWORDS = {**WorkoutParser.SPECIAL_KEYWORDS, 'spin': StepType.RECOVERY}
+
+    assert SpinParser().parse("spin 5min")[0].name == "Recovery"
+    with pytest.raises(WorkoutParseError):
+        WorkoutParser().parse("spin 5min")
+
+
+def test_steady_ramp_and_range_power_targets():
+    step = parse_one("5min 85-95% FTP")
+    assert step.step_type == StepType.RAMP
+    assert (step.power_low_pct, step.power_high_pct) == (85, 95)
+    assert step.name == "Ramp 85%-95%"
+
+    step = parse_one("5min 30% - 70% FTP")
+    assert step.step_type == StepType.RAMP
+    assert (step.power_low_pct, step.power_high_pct) == (30, 70)
+
+    step = parse_one("5min 100–110% FTP")
+    assert (step.power_low_pct, step.power_high_pct) == (100, 110)
+
+    # A dash elsewhere on the line does not make a steady target a ramp
+    step = parse_one("5min 90% FTP - hard")
+    assert step.step_type == StepType.STEADY
+    assert (step.power_low_pct, step.power_high_pct) == (90, 90)
+    assert step.name == "90% FTP"
+
+    # A ramp anywhere on the line wins over a steady target
+    step = parse_one("2min 70% FTP - 90-100% FTP")
+    assert step.step_type == StepType.RAMP
+    assert (step.power_low_pct, step.power_high_pct) == (90, 100)
+
+
+def test_heart_rate_targets():
+    step = parse_one("10min 75-85% HR")
+    assert step.target_type == TargetType.HEART_RATE
+    assert (step.hr_low, step.hr_high, step.hr_is_percentage) == (75, 85, True)
+    assert step.name == "75%-85% HR"
+
+    step = parse_one("10min 75% max HR")
+    assert (step.hr_low, step.hr_high, step.hr_is_percentage) == (75, 75, True)
+
+    step = parse_one("10min 150-160 bpm")
+    assert (step.hr_low, step.hr_high, step.hr_is_percentage) == (150, 160, False)
+    assert step.name == "150-160 bpm"
+
+    # HR next to a power target is secondary
+    step = parse_one("5min 80% FTP 150 bpm")
+    assert step.target_type == TargetType.POWER
+    assert step.power_low_pct == 80
+    assert (step.hr_target_type, step.hr_low) == (TargetType.HEART_RATE, 150)
+
+
+def test_first_duration_and_target_win():
+    step = parse_one("5min 10min 80% FTP 90% FTP")
+    assert step.duration_seconds == 300
+    assert step.power_low_pct == 80
+
+    step = parse_one("5min 140 bpm 150 bpm")
+    assert (step.hr_low, step.hr_high) == (140, 140)
+
+
+def test_durations():
+    assert parse_one("30s 150% FTP").duration_seconds == 30
+    assert parse_one("20 sec 150% FTP").duration_seconds == 20
+    assert parse_one("2 minutes 90% FTP").duration_seconds == 120
+    assert parse_one("1.5hr 65% of FTP").duration_seconds == 5400
+
+
+def test_repeat_prefix():
+    step = parse_one("3x 2min 100% FTP")
+    assert step.step_type == StepType.REPEAT
+    assert step.repeat_count == 3
+    assert step.name == "3x 100% FTP"
+    assert len(step.repeat_steps) == 1
+    inner = step.repeat_steps[0]
+    assert (inner.duration_seconds, inner.power_low_pct) == (120, 100)
+
+
+def test_notes_are_not_parsed_as_targets():
+    step = parse_one('5min 90% FTP "then 3min 120% FTP"')
+    assert step.duration_seconds == 300
+    assert step.power_low_pct == 90
+    assert step.notes == "then 3min 120% FTP"
+
+    step = parse_one('"2min 120% FTP" 5min 90% FTP')
+    assert step.duration_seconds == 300
+    assert step.power_low_pct == 90
+
+
+def test_parsed_steps_are_independent_copies():
+    parser = WorkoutParser()
+    first, second = parser.parse("5min 90% FTP\n5min 90% FTP")
+    first.power_low_pct = 50
+    assert second.power_low_pct == 90
+    assert parser.parse("5min 90% FTP")[0].power_low_pct == 90